@@ -0,0 +1,233 @@
+"""
+转发并发自适应控制模块（AIMD：加性增、乘性减）
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple, Type
+
+
+@dataclass
+class LimitAdjustment:
+    """一次并发上限调整记录"""
+
+    timestamp: float  # 调整时间
+    scope: str  # 作用范围: "global" 或 "group:<群号>"
+    old_limit: int  # 调整前上限
+    new_limit: int  # 调整后上限
+    reason: str  # 调整原因
+
+
+class AIMDLimiter:
+    """单个作用范围的 AIMD 并发限制器"""
+
+    def __init__(
+        self,
+        scope: str,
+        initial_limit: int = 1,
+        min_limit: int = 1,
+        max_limit: int = 8,
+        latency_threshold: float = 2.0,
+        error_threshold: float = 0.3,
+        decrease_factor: float = 0.5,
+        ewma_alpha: float = 0.2,
+    ):
+        self.scope = scope
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.latency_threshold = latency_threshold  # 平均延迟阈值(秒)
+        # 错误率阈值，应高于 ewma_alpha：从零开始的单次失败只会让错误率升到
+        # ewma_alpha，不会触发降低；短时间内连续失败才会超过阈值
+        self.error_threshold = max(error_threshold, ewma_alpha)
+        self.decrease_factor = decrease_factor
+        self.ewma_alpha = ewma_alpha
+
+        self.in_flight = 0
+        self.avg_latency = 0.0
+        self.error_rate = 0.0
+        self.samples = 0
+        self._decrease_guard = 0  # 乘性减后还需完成多少次调用才允许再次降低
+        self._condition = asyncio.Condition()
+
+    @property
+    def current_limit(self) -> int:
+        """当前允许的并发数"""
+        return int(self.limit)
+
+    async def acquire(self) -> None:
+        """等待并占用一个并发名额"""
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: self.in_flight < self.current_limit
+            )
+            self.in_flight += 1
+
+    async def release(self) -> None:
+        """释放一个并发名额"""
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def record(self, latency: float, success: bool) -> Optional[LimitAdjustment]:
+        """
+        记录一次调用结果并调整并发上限
+
+        Args:
+            latency: 调用耗时(秒)
+            success: 调用是否成功
+
+        Returns:
+            Optional[LimitAdjustment]: 若上限发生变化则返回调整记录
+        """
+        alpha = self.ewma_alpha
+        if self.samples == 0:
+            self.avg_latency = latency
+        else:
+            self.avg_latency += alpha * (latency - self.avg_latency)
+        self.error_rate += alpha * ((0.0 if success else 1.0) - self.error_rate)
+        self.samples += 1
+        if self._decrease_guard > 0:
+            self._decrease_guard -= 1
+
+        old_limit = self.current_limit
+        now = time.monotonic()
+
+        # 只有本次调用失败或变慢、且 EWMA 也超过阈值时才降低上限：
+        # EWMA 过滤偶发的单次错误/慢调用，本次样本避免错误后的成功调用继续减半
+        if not success and self.error_rate > self.error_threshold:
+            reason = f"错误率 {self.error_rate * 100:.0f}%"
+        elif (
+            latency > self.latency_threshold
+            and self.avg_latency > self.latency_threshold
+        ):
+            reason = f"平均延迟 {self.avg_latency * 1000:.0f}ms"
+        else:
+            reason = ""
+
+        if reason:
+            # 乘性减：每个窗口只降一次。降低前已在进行的调用(至多 old_limit 个)
+            # 反映的是旧上限下的状况，等它们完成后才允许再次降低
+            if self._decrease_guard > 0:
+                return None
+            self._decrease_guard = old_limit
+            self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+        elif (
+            success
+            and latency <= self.latency_threshold
+            and self.error_rate <= self.error_threshold
+            and self.avg_latency <= self.latency_threshold
+        ):
+            # 加性增：仅在 EWMA 健康时进行，每满一个窗口(current_limit 次成功)上限 +1；
+            # 否则持续出错时成功调用的增长会抵消冷却期内的降低
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+            reason = "调用健康"
+
+        new_limit = self.current_limit
+        if new_limit == old_limit:
+            return None
+        return LimitAdjustment(now, self.scope, old_limit, new_limit, reason)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """获取当前状态"""
+        return {
+            "scope": self.scope,
+            "limit": self.current_limit,
+            "in_flight": self.in_flight,
+            "avg_latency_ms": self.avg_latency * 1000,
+            "error_rate": self.error_rate,
+            "samples": self.samples,
+        }
+
+
+class AdaptiveConcurrencyController:
+    """全局 + 按目标群的自适应并发控制器"""
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        group_max_concurrency: int = 2,
+        latency_threshold_ms: int = 2000,
+        history_size: int = 20,
+    ):
+        self.latency_threshold = latency_threshold_ms / 1000
+        self.group_max_concurrency = group_max_concurrency
+        self.global_limiter = AIMDLimiter(
+            "global",
+            initial_limit=min(2, max_concurrency),
+            max_limit=max_concurrency,
+            latency_threshold=self.latency_threshold,
+        )
+        self.group_limiters: Dict[int, AIMDLimiter] = {}
+        self.adjustments: Deque[LimitAdjustment] = deque(maxlen=history_size)
+
+    def _get_group_limiter(self, target_group: int) -> AIMDLimiter:
+        limiter = self.group_limiters.get(target_group)
+        if limiter is None:
+            limiter = AIMDLimiter(
+                f"group:{target_group}",
+                initial_limit=1,
+                max_limit=self.group_max_concurrency,
+                latency_threshold=self.latency_threshold,
+            )
+            self.group_limiters[target_group] = limiter
+        return limiter
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        target_group: int,
+        group_only_errors: Tuple[Type[BaseException], ...] = (),
+    ) -> AsyncIterator[None]:
+        """
+        占用目标群和全局的并发名额，并在结束时按耗时与结果调整上限
+
+        调用中抛出的异常会计为一次失败并继续向外抛出；任务被取消时不计入统计
+
+        Args:
+            target_group: 目标群号
+            group_only_errors: 只计入目标群限制器的异常类型（如群不存在等
+                配置/数据错误），不影响其他群共享的全局上限
+        """
+        group_limiter = self._get_group_limiter(target_group)
+        # 先占群名额再占全局名额，避免拥塞的群长期霸占全局名额
+        await group_limiter.acquire()
+        try:
+            await self.global_limiter.acquire()
+            start = time.monotonic()
+            success = False
+            limiters = [group_limiter, self.global_limiter]
+            try:
+                yield
+                success = True
+            except group_only_errors:
+                limiters = [group_limiter]
+                raise
+            except Exception:
+                raise
+            except BaseException:
+                limiters = []
+                raise
+            finally:
+                latency = time.monotonic() - start
+                for limiter in limiters:
+                    adjustment = limiter.record(latency, success)
+                    if adjustment:
+                        self.adjustments.append(adjustment)
+                await self.global_limiter.release()
+        finally:
+            await group_limiter.release()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """获取并发控制统计信息"""
+        groups: List[Dict[str, Any]] = [
+            limiter.snapshot() for limiter in self.group_limiters.values()
+        ]
+        return {
+            "global": self.global_limiter.snapshot(),
+            "groups": groups,
+            "recent_adjustments": list(self.adjustments),
+        }
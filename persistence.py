@@ -0,0 +1,233 @@
+"""
+转发规则持久化模块：合并短时间内的多次修改，后台线程原子写入磁盘
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set
+
+if TYPE_CHECKING:
+    from .rules import ForwardRule
+
+
+def hash_rules_data(rules_data: List[Dict[str, Any]]) -> str:
+    """计算规则配置的哈希值"""
+    data = json.dumps(rules_data, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class RulePersister:
+    """
+    规则持久化器（防抖 + 增量序列化 + 临时文件重命名）
+
+    规则文件记录了生成它时配置中 rules 的哈希值，配置中的规则被修改后
+    规则文件即失效，以配置为准
+    """
+
+    def __init__(
+        self,
+        get_rules: Callable[[], List["ForwardRule"]],
+        path: Optional[str | Path] = None,
+        debounce: float = 0.5,
+        max_delay: Optional[float] = None,
+        retry_interval: float = 5.0,
+    ):
+        """
+        Args:
+            get_rules: 返回当前规则列表的函数
+            path: 规则文件路径，为空时不持久化
+            debounce: 防抖时间(秒)，窗口内的多次修改只写一次
+            max_delay: 从第一次修改到写入的最长等待时间(秒)，默认为 10 倍防抖时间
+            retry_interval: 保存失败后的重试间隔(秒)
+        """
+        self.get_rules = get_rules
+        self.path = Path(path) if path else None
+        self.debounce = debounce
+        self.max_delay = max_delay if max_delay is not None else debounce * 10
+        self.retry_interval = retry_interval
+
+        self._cache: Dict[str, Dict[str, Any]] = {}  # 规则名 -> 已序列化的规则
+        self._config_hash = ""  # 当前规则所基于的配置规则哈希
+        self._dirty: Set[str] = set()
+        self._first_dirty = 0.0  # 本批修改中第一次修改的时间
+        self._deadline = 0.0
+        self._stopped = False
+        self._condition = threading.Condition()
+        # 保证同一时刻只有一个线程在序列化/写盘，且写入顺序与收集顺序一致
+        self._write_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        if self.path:
+            self._worker = threading.Thread(
+                target=self._run, name="ForwardRulePersister", daemon=True
+            )
+            self._worker.start()
+
+    def load(self, config_hash: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        从规则文件读取规则数据
+
+        Args:
+            config_hash: 当前配置中规则的哈希值
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: 文件不存在、已损坏或与配置不一致时返回 None
+        """
+        if not self.path or not self.path.exists():
+            return None
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 规则文件读取失败，改用配置中的规则: {self.path} - {e}")
+            return None
+        if not isinstance(data, dict) or not isinstance(data.get("rules"), list):
+            print(f"⚠️ 规则文件格式错误，改用配置中的规则: {self.path}")
+            return None
+        if data.get("config_hash") != config_hash:
+            print(f"配置中的规则已修改，规则文件已失效: {self.path}")
+            return None
+        return data["rules"]
+
+    def reset(self, rules_data: List[Dict[str, Any]], config_hash: str) -> None:
+        """以已加载的规则数据重置序列化缓存"""
+        with self._condition:
+            self._cache = {
+                data["name"]: dict(data) for data in rules_data if "name" in data
+            }
+            self._config_hash = config_hash
+            self._dirty.clear()
+
+    def mark_dirty(self, *rule_names: str) -> None:
+        """标记规则已修改（包括新增和删除），并在防抖窗口结束后保存"""
+        if not self.path:
+            return
+        with self._condition:
+            now = time.monotonic()
+            if not self._dirty:
+                self._first_dirty = now
+            self._dirty.update(rule_names)
+            # 持续修改时也不会无限推迟，最迟在 max_delay 后写入
+            self._deadline = min(
+                now + self.debounce, self._first_dirty + self.max_delay
+            )
+            self._condition.notify()
+
+    def mark_all_dirty(self) -> None:
+        """标记所有规则已修改"""
+        names = {rule.name for rule in self.get_rules()}
+        with self._condition:
+            names.update(self._cache)
+        self.mark_dirty(*names)
+
+    def flush(self) -> bool:
+        """
+        立即保存所有待写入的修改
+
+        Returns:
+            bool: 是否没有遗留未保存的修改；失败的修改会保留并稍后重试
+        """
+        with self._write_lock:
+            with self._condition:
+                if not self._dirty:
+                    return True
+                names = set(self._dirty)
+                config_hash = self._config_hash
+                try:
+                    rules_data = self._collect()
+                except Exception as e:
+                    print(f"序列化规则失败: {e}")
+                    self._retry_later()
+                    return False
+
+            if self._write(rules_data, config_hash):
+                return True
+
+            with self._condition:
+                self._dirty.update(names)
+                self._retry_later()
+            return False
+
+    def close(self) -> bool:
+        """停止后台线程并写入剩余修改，返回是否全部保存成功"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._worker:
+            self._worker.join()
+        return self.flush()
+
+    def _retry_later(self) -> None:
+        """保存失败后推迟重试，避免后台线程空转（需持有锁）"""
+        now = time.monotonic()
+        self._first_dirty = now
+        self._deadline = now + self.retry_interval
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._dirty and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                # 防抖：直到窗口内不再有新修改才开始写
+                while not self._stopped:
+                    remaining = self._deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if self._stopped:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                # 后台线程不能因异常退出，否则之后的修改都不会再写入
+                print(f"规则持久化线程出错: {e}")
+                with self._condition:
+                    self._retry_later()
+
+    def _collect(self) -> List[Dict[str, Any]]:
+        """只重新序列化脏规则，返回按当前规则顺序排列的完整数据（需持有锁）"""
+        rules = list(self.get_rules())
+        current = {rule.name: rule for rule in rules}
+        for name in self._dirty:
+            rule = current.get(name)
+            if rule is None:
+                self._cache.pop(name, None)
+            else:
+                self._cache[name] = rule.to_dict()
+        self._dirty.clear()
+
+        return [self._cache[rule.name] for rule in rules if rule.name in self._cache]
+
+    def _write(self, rules_data: List[Dict[str, Any]], config_hash: str) -> bool:
+        try:
+            if not self.path:
+                return True
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(
+                        {"config_hash": config_hash, "rules": rules_data},
+                        f,
+                        ensure_ascii=False,
+                        indent=2,
+                    )
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            return True
+        except Exception as e:
+            print(f"保存规则文件失败: {e}")
+            return False
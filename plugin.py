@@ -10,6 +10,7 @@ from ncatbot.plugin_system import (
 )
 from ncatbot.utils import config, get_log
 
+from .concurrency import AdaptiveConcurrencyController
 from .forward_admin_filter import ForwardAdminFilter
 from .rules import ForwardRuleManager
 
@@ -24,6 +25,7 @@ class ForwardBotPlugin(NcatBotPlugin):
     logger = get_log("ForwardBotPlugin")
 
     manager: ForwardRuleManager
+    concurrency: AdaptiveConcurrencyController
 
     forward_command_group = command_registry.group(
         "forward", description="消息转发模块命令"
@@ -41,17 +43,42 @@ class ForwardBotPlugin(NcatBotPlugin):
         self.rbac_manager.add_role("forward_admin")
         self.register_config("enabled", True)
         self.register_config("send_interval_ms", 500)
+        self.register_config("max_concurrency", 8, "全局最大转发并发数")
+        self.register_config("group_max_concurrency", 2, "单个目标群最大转发并发数")
+        self.register_config(
+            "latency_threshold_ms", 2000, "转发延迟阈值(毫秒)，超过后降低并发"
+        )
 
         self.register_config("rules", [], "转发规则列表", value_type=list)
         self.register_config("admins", [], "转发管理员列表", value_type=list)
+        self.register_config(
+            "rules_file", "data/ForwardBotPlugin/rules.json", "规则持久化文件路径"
+        )
+        self.register_config(
+            "save_debounce_ms", 500, "规则保存防抖时间(毫秒)，窗口内的修改合并写入"
+        )
 
-        self.manager = ForwardRuleManager(self.config)
+        self.manager = ForwardRuleManager(
+            self.config,
+            rules_path=self.config["rules_file"],
+            save_debounce=self.config["save_debounce_ms"] / 1000,
+        )
+        self.concurrency = AdaptiveConcurrencyController(
+            max_concurrency=self.config["max_concurrency"],
+            group_max_concurrency=self.config["group_max_concurrency"],
+            latency_threshold_ms=self.config["latency_threshold_ms"],
+        )
 
         # 为配置的每个 admin 赋予权限
         for admin in self.manager.admins:
             self.rbac_manager.assign_role_to_user(str(admin), "forward_admin")
             self.logger.info(f"✅ 已赋予转发管理员权限: {admin}")
 
+    async def on_close(self) -> None:
+        # 写入尚未落盘的规则修改，磁盘 I/O 放到线程中避免阻塞事件循环
+        if not await asyncio.to_thread(self.manager.close):
+            self.logger.error("❌ 规则修改未能全部保存到文件")
+
     @root_filter
     @forward_admins_command_group.command("add")
     @param(name="user_id", default="", help="要添加的管理员QQ号")
@@ -161,6 +188,8 @@ class ForwardBotPlugin(NcatBotPlugin):
     • 监听的源群：{", ".join(map(str, rule_stats["source_groups_list"][:5]))}{"..." if len(rule_stats["source_groups_list"]) > 5 else ""}
     • 转发目标群：{", ".join(map(str, rule_stats["target_groups_list"][:5]))}{"..." if len(rule_stats["target_groups_list"]) > 5 else ""}"""
 
+                stats_text += self._format_concurrency_stats()
+
             await event.reply(stats_text)
             self.logger.info(f"📊 用户查看统计信息：群 {event.group_id}")
 
@@ -168,6 +197,32 @@ class ForwardBotPlugin(NcatBotPlugin):
             self.logger.error(f"❌ 处理统计命令时出错: {e}")
             await event.reply("❌ 获取统计信息失败")
 
+    def _format_concurrency_stats(self) -> str:
+        """格式化自适应并发控制的统计信息"""
+        concurrency_stats = self.concurrency.get_statistics()
+        global_stats = concurrency_stats["global"]
+
+        text = f"""
+
+    ⚙️ 并发控制：
+    • 全局并发上限：{global_stats["limit"]} (进行中 {global_stats["in_flight"]})
+    • 平均延迟：{global_stats["avg_latency_ms"]:.0f}ms
+    • 近期错误率：{global_stats["error_rate"] * 100:.1f}%"""
+
+        groups = sorted(concurrency_stats["groups"], key=lambda g: g["limit"])[:5]
+        if groups:
+            text += "\n    • 目标群上限：" + ", ".join(
+                f"{g['scope'].removeprefix('group:')}={g['limit']}" for g in groups
+            )
+
+        adjustments = concurrency_stats["recent_adjustments"][-5:]
+        if adjustments:
+            text += "\n    • 最近调整："
+            for adj in reversed(adjustments):
+                text += f"\n      - {adj.scope}: {adj.old_limit} → {adj.new_limit} ({adj.reason})"
+
+        return text
+
     @ForwardAdminFilter()
     @forward_rules_command_group.command("list")
     @option(short_name="d", long_name="detailed", help="启用详细格式")
@@ -258,9 +313,6 @@ class ForwardBotPlugin(NcatBotPlugin):
             if self.manager.remove_rule(rule_name):
                 await event.reply(f"✅ 成功删除规则 '{rule_name}'")
                 self.logger.info(f"🗑️ 规则已删除：{rule_name} (群 {event.group_id})")
-
-                # 重新加载配置以确保一致性
-                self.manager.load_config()
             else:
                 await event.reply(f"❌ 删除规则 '{rule_name}' 失败")
 
@@ -347,7 +399,11 @@ class ForwardBotPlugin(NcatBotPlugin):
         """
         for attempt in range(max_retries + 1):
             try:
-                await self.api.forward_group_single_msg(target_group, message_id)
+                # 群不存在、消息已撤回等错误不代表限流，只计入该群的限制器
+                async with self.concurrency.slot(
+                    target_group, group_only_errors=(AttributeError,)
+                ):
+                    await self.api.forward_group_single_msg(target_group, message_id)
                 await self.api.set_msg_emoji_like(message_id, 124, True)
 
                 self.forward_stats["success"] += 1
@@ -414,18 +470,20 @@ class ForwardBotPlugin(NcatBotPlugin):
                     self.logger.info(
                         f"🚀 开始转发: {source_group} -> {target_group} (规则: {rule.name})"
                     )
-                    success = await self.safe_forward_message(
-                        target_group, message_id, rule.name
+                    forward_tasks.append(
+                        self.safe_forward_message(target_group, message_id, rule.name)
                     )
-                    forward_tasks.append((target_group, success))
                 else:
                     self.logger.debug(
                         f"🚫 规则 {rule.name} 不允许从 {source_group} 转发到 {target_group}"
                     )
 
+        # 并发转发，实际并发数由自适应并发控制器限制
+        results = await asyncio.gather(*forward_tasks)
+
         # 统计结果
-        successful_forwards = sum(1 for _, success in forward_tasks if success)
-        total_forwards = len(forward_tasks)
+        successful_forwards = sum(1 for success in results if success)
+        total_forwards = len(results)
 
         if total_forwards > 0:
             self.logger.info(
@@ -5,6 +5,10 @@
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, asdict
 from enum import Enum
+from pathlib import Path
+import time
+
+from .persistence import RulePersister, hash_rules_data
 
 
 class RuleType(Enum):
@@ -96,44 +100,89 @@ class ForwardRule:
 class ForwardRuleManager:
     """转发规则管理器"""
 
-    def __init__(self, config: dict = {}):
+    def __init__(
+        self,
+        config: dict = {},
+        rules_path: Optional[str | Path] = None,
+        save_debounce: float = 0.5,
+    ):
         self.config = config
         self.rules: List[ForwardRule] = []
+        # 源群号 -> 监听该群的规则（保持规则顺序）
+        self.source_index: Dict[int, List[ForwardRule]] = {}
+        self.persister = RulePersister(
+            lambda: self.rules,
+            path=rules_path,
+            debounce=save_debounce,
+        )
         self.load_config()
 
     def load_config(self) -> None:
         """加载配置文件"""
         try:
-            # 加载转发规则
-            rules_data = self.config.get("rules", [])
+            # 加载转发规则，规则文件基于当前配置生成时以其为准，否则以配置为准
             self.admins: list[int] = self.config.get("admins", [])
+            config_rules = self.config.get("rules", [])
+            config_hash = hash_rules_data(config_rules)
+            rules_data = self.persister.load(config_hash)
+            if rules_data is None:
+                rules_data = config_rules
+
+            start_time = time.perf_counter()
             self.rules = []
+            loaded_data = []
 
             for rule_data in rules_data:
                 try:
                     rule = ForwardRule.from_dict(rule_data)
                     self.rules.append(rule)
+                    loaded_data.append(rule_data)
                 except Exception as e:
                     print(f"加载规则失败: {rule_data.get('name', 'Unknown')} - {e}")
 
-            print(f"成功加载 {len(self.rules)} 条转发规则")
+            self._rebuild_index()
+            self.persister.reset(loaded_data, config_hash)
+
+            elapsed = (time.perf_counter() - start_time) * 1000
+            print(f"成功加载 {len(self.rules)} 条转发规则 (耗时 {elapsed:.1f}ms)")
 
         except Exception as e:
             print(f"加载配置文件失败: {e}")
             self.rules = []
+            self.source_index = {}
 
-    def save_config(self) -> bool:
-        """保存配置到文件"""
-        try:
-            # 读取现有配置
-            self.config["rules"] = [rule.to_dict() for rule in self.rules]
+    def _rebuild_index(self) -> None:
+        """重建源群索引"""
+        source_index: Dict[int, List[ForwardRule]] = {}
+        for rule in self.rules:
+            for group in dict.fromkeys(rule.source_groups):
+                source_index.setdefault(group, []).append(rule)
+        self.source_index = source_index
+
+    def save_config(self, *rule_names: str) -> bool:
+        """
+        保存配置到文件
+
+        修改会在防抖窗口结束后由后台线程写入，不阻塞调用方
 
+        Args:
+            rule_names: 发生变化的规则名称，为空时保存全部规则
+        """
+        try:
+            if rule_names:
+                self.persister.mark_dirty(*rule_names)
+            else:
+                self.persister.mark_all_dirty()
             return True
 
         except Exception as e:
             print(f"保存配置文件失败: {e}")
             return False
 
+    def close(self) -> bool:
+        """写入未保存的修改并停止后台持久化线程，返回是否全部保存成功"""
+        return self.persister.close()
+
     def add_rule(self, rule: ForwardRule) -> bool:
         """添加新规则"""
         # 检查规则名是否重复
@@ -145,7 +194,8 @@ class ForwardRuleManager:
             # 验证规则数据
             rule.__post_init__()
             self.rules.append(rule)
-            return self.save_config()
+            self._rebuild_index()
+            return self.save_config(rule.name)
         except Exception as e:
             print(f"添加规则失败: {e}")
             return False
@@ -156,7 +206,8 @@ class ForwardRuleManager:
         self.rules = [rule for rule in self.rules if rule.name != rule_name]
 
         if len(self.rules) < original_count:
-            return self.save_config()
+            self._rebuild_index()
+            return self.save_config(rule_name)
         else:
             print(f"未找到规则: {rule_name}")
             return False
@@ -173,7 +224,7 @@ class ForwardRuleManager:
         rule = self.get_rule(rule_name)
         if rule:
             rule.enabled = True
-            return self.save_config()
+            return self.save_config(rule_name)
         else:
             print(f"未找到规则: {rule_name}")
             return False
@@ -183,7 +234,7 @@ class ForwardRuleManager:
         rule = self.get_rule(rule_name)
         if rule:
             rule.enabled = False
-            return self.save_config()
+            return self.save_config(rule_name)
         else:
             print(f"未找到规则: {rule_name}")
             return False
@@ -196,8 +247,9 @@ class ForwardRuleManager:
         """查找匹配消息的规则"""
         matching_rules = []
 
-        for rule in self.get_enabled_rules():
-            if source_group in rule.source_groups and rule.matches_message(message):
+        # 通过源群索引只检查监听该群的规则，禁用规则由 matches_message 过滤
+        for rule in self.source_index.get(source_group, []):
+            if rule.matches_message(message):
                 matching_rules.append(rule)
 
         return matching_rules
@@ -0,0 +1,102 @@
+"""
+自适应并发控制模拟：用可调延迟/失败率的桩 API 驱动 AdaptiveConcurrencyController，
+依次经过「正常 → 变慢 → 频繁失败 → 恢复」四个阶段，检查并发上限是否随之收敛
+
+用法：python scripts/simulate_concurrency.py
+"""
+
+import asyncio
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from concurrency import AdaptiveConcurrencyController  # noqa: E402
+
+MAX_CONCURRENCY = 8
+GROUP_MAX_CONCURRENCY = 2
+LATENCY_THRESHOLD_MS = 100
+TARGET_GROUPS = [101, 102, 103, 104]
+WORKERS = 32
+
+
+class StubAPI:
+    """模拟 NapCat 转发接口，延迟和失败率可在运行中修改"""
+
+    def __init__(self):
+        self.delay = 0.01
+        self.fail_rate = 0.0
+
+    async def forward_group_single_msg(self, group_id: int, message_id: str) -> None:
+        await asyncio.sleep(self.delay)
+        if random.random() < self.fail_rate:
+            raise RuntimeError("rate limited")
+
+
+async def run_phase(
+    controller: AdaptiveConcurrencyController,
+    api: StubAPI,
+    duration: float,
+) -> None:
+    """在 duration 秒内持续并发转发，到时取消仍在等待或进行中的调用"""
+
+    async def worker(index: int) -> None:
+        target_group = TARGET_GROUPS[index % len(TARGET_GROUPS)]
+        while True:
+            try:
+                async with controller.slot(target_group):
+                    await api.forward_group_single_msg(target_group, "0")
+            except RuntimeError:
+                pass
+
+    tasks = [asyncio.create_task(worker(i)) for i in range(WORKERS)]
+    await asyncio.sleep(duration)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def main() -> int:
+    random.seed(0)
+    api = StubAPI()
+    controller = AdaptiveConcurrencyController(
+        max_concurrency=MAX_CONCURRENCY,
+        group_max_concurrency=GROUP_MAX_CONCURRENCY,
+        latency_threshold_ms=LATENCY_THRESHOLD_MS,
+    )
+
+    # (阶段名, 延迟秒, 失败率, 持续秒, 期望全局上限范围)
+    phases = [
+        ("正常", 0.01, 0.0, 3.0, (MAX_CONCURRENCY, MAX_CONCURRENCY)),
+        ("变慢", 0.3, 0.0, 4.0, (1, 2)),
+        ("频繁失败", 0.01, 0.5, 4.0, (1, 2)),
+        ("恢复", 0.01, 0.0, 4.0, (MAX_CONCURRENCY, MAX_CONCURRENCY)),
+    ]
+
+    converged = True
+    for name, delay, fail_rate, duration, (low, high) in phases:
+        api.delay = delay
+        api.fail_rate = fail_rate
+        await run_phase(controller, api, duration)
+
+        stats = controller.get_statistics()
+        global_limit = stats["global"]["limit"]
+        group_limits = [group["limit"] for group in stats["groups"]]
+        ok = low <= global_limit <= high
+        converged = converged and ok
+        print(
+            f"{'✅' if ok else '❌'} {name}: 延迟 {delay * 1000:.0f}ms, "
+            f"失败率 {fail_rate * 100:.0f}% -> 全局上限 {global_limit} "
+            f"(期望 {low}~{high}), 群上限 {group_limits}"
+        )
+
+    print("\n最近调整：")
+    for adj in controller.get_statistics()["recent_adjustments"][-10:]:
+        print(f"  {adj.scope}: {adj.old_limit} → {adj.new_limit} ({adj.reason})")
+
+    return 0 if converged else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))